@@ -1,9 +1,40 @@
+import os
+import shelve
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.logger import logger
 from utils.selenium_driver import SeleniumDriver
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
 from utils.hanja_tool import is_hanja, hanja_to_url, standardize_hanja
 from utils.csv import export_to_csv
 
+# Location of the persistent cache holding previously fetched Hanja data
+HANJA_CACHE_PATH = "data/cache/hanja"
+
+# Script reading the text and link of the first Hanja search result
+HANJA_SEARCH_SCRIPT = """
+const link = document.querySelector(".row")?.querySelector(".hanja_word .hanja_link");
+return link ? {text: link.innerText.trim(), href: link.href} : null;
+"""
+
+# Script collecting every field of the Hanja detail page in a single WebDriver call
+HANJA_ENTRY_SCRIPT = """
+const entry = document.querySelector(".component_entry");
+const infos = entry.querySelectorAll(".entry_infos .info_item");
+return {
+    meaning: entry.querySelector(".entry_title .mean").innerText.trim(),
+    radical: infos[0].querySelector("button").innerText.trim(),
+    stroke: entry.querySelector(".entry_infos .stroke span.word").innerText.trim(),
+    cate: infos[1].querySelector(".info_item .cate").innerText.trim(),
+    desc: infos[1].querySelector(".desc")?.innerText.trim() ?? "",
+    unicode: entry.querySelector(".entry_infos .unicode .desc").innerText.trim(),
+    usage: [...entry.querySelectorAll(".entry_condition .unit_tooltip")].map(
+        (usage) => usage.innerText.trim()
+    ),
+};
+"""
+
 
 def fetch_hanja_data(hanja, browser):
     """
@@ -22,13 +53,13 @@ def fetch_hanja_data(hanja, browser):
     url = f"https://hanja.dict.naver.com/search?query={encoded_hanja}"
     browser.get_await(url=url, locator=(By.ID, "searchPage_letter"))
 
-    hanja_obj = browser.find_elements(By.CSS_SELECTOR, ".row")[0].find_element(
-        By.CSS_SELECTOR, ".hanja_word .hanja_link"
-    )
+    # Read the link of the first search result in one round trip to the browser
+    hanja_obj = browser.execute_script(HANJA_SEARCH_SCRIPT)
 
     # Step 2: Extract the Hanja ID
-    if hanja_obj.text == standardize_hanja(hanja):
-        hanja_id = hanja_obj.get_attribute("href").split("/")[-1]
+    hanja_text = hanja_obj["text"] if hanja_obj else None
+    if hanja_text == standardize_hanja(hanja):
+        hanja_id = hanja_obj["href"].split("/")[-1]
     else:
         return {"hanja": hanja}
 
@@ -36,42 +67,26 @@ def fetch_hanja_data(hanja, browser):
     detailed_url = f"https://hanja.dict.naver.com/#/entry/ccko/{hanja_id}"
     browser.get_await(url=detailed_url, locator=(By.CLASS_NAME, "component_entry"))
 
-    # Step 4: Save WebElements for repetitive calls
-    hanja_entry = browser.find_element(By.CSS_SELECTOR, ".component_entry")
-    hanja_infos = hanja_entry.find_elements(By.CSS_SELECTOR, ".entry_infos .info_item")
+    # Step 4: Collect the detail page fields in one round trip to the browser
+    hanja_info = browser.execute_script(HANJA_ENTRY_SCRIPT)
 
     # Step 5: Extract Hanja Information from web crawling
-    hanja_meaning = hanja_entry.find_element(By.CSS_SELECTOR, ".entry_title .mean").text
-    hanja_radical = hanja_infos[0].find_element(By.TAG_NAME, "button").text
-    hanja_stroke_count = int(
-        hanja_entry.find_element(
-            By.CSS_SELECTOR, ".entry_infos .stroke span.word"
-        ).text[:-1]
-    )
-    if hanja_infos[1].find_element(By.CSS_SELECTOR, ".info_item .cate").text == "모양자":
-        formation_letters = (
-            hanja_infos[1].find_element(By.CSS_SELECTOR, ".desc").text.split(" + ")
-        )
+    hanja_stroke_count = int(hanja_info["stroke"][:-1])
+    if hanja_info["cate"] == "모양자":
+        formation_letters = hanja_info["desc"].split(" + ")
         formation_letter = tuple(seg[0] for seg in formation_letters)
     else:
         formation_letter = None
-    unicode = hanja_entry.find_element(
-        By.CSS_SELECTOR, ".entry_infos .unicode .desc"
-    ).text
-    usage = tuple(
-        usage.text
-        for usage in hanja_entry.find_elements(
-            By.CSS_SELECTOR, ".entry_condition .unit_tooltip"
-        )
-    )
+    usage = tuple(hanja_info["usage"])
+
     # Step 6: Create a dictionary with Hanja information
     hanja_data = {
         "hanja": hanja,
-        "meaning_official": hanja_meaning,
-        "radical": hanja_radical,
+        "meaning_official": hanja_info["meaning"],
+        "radical": hanja_info["radical"],
         "stroke_count": hanja_stroke_count,
         "formation_letter": formation_letter,
-        "unicode": unicode,
+        "unicode": hanja_info["unicode"],
         "usage": usage,
         "naver_hanja_id": hanja_id,
     }
@@ -103,21 +118,21 @@ def export_hanja_csv_data(hanja_objs, filename=None):
         "naver_hanja_id",
     ]
 
-    # Align data with fieldnames
-    csv_data = []
-    for hanja_item in hanja_objs:
-        csv_data.append(
-            {
-                "hanja": hanja_item["hanja"],
-                "meaning_official": hanja_item["meaning_official"],
-                "radical": hanja_item["radical"],
-                "stroke_count": hanja_item["stroke_count"],
-                "formation_letter": "+".join(hanja_item["formation_letter"]),
-                "unicode": hanja_item["unicode"],
-                "usage": "·".join(hanja_item["usage"]),
-                "naver_hanja_id": hanja_item["naver_hanja_id"],
-            }
-        )
+    # Align data with fieldnames, skipping Hanja characters that failed to fetch
+    csv_data = [
+        {
+            "hanja": hanja_item["hanja"],
+            "meaning_official": hanja_item["meaning_official"],
+            "radical": hanja_item["radical"],
+            "stroke_count": hanja_item["stroke_count"],
+            "formation_letter": "+".join(hanja_item["formation_letter"] or ()),
+            "unicode": hanja_item["unicode"],
+            "usage": "·".join(hanja_item["usage"] or ()),
+            "naver_hanja_id": hanja_item["naver_hanja_id"],
+        }
+        for hanja_item in hanja_objs
+        if hanja_item.get("naver_hanja_id") is not None
+    ]
 
     if filename:
         export_to_csv(fieldnames, csv_data, csv_keyword, filename)
@@ -128,46 +143,131 @@ def export_hanja_csv_data(hanja_objs, filename=None):
     return filename
 
 
-def scrape_hanja(hanja_input=None, instant_csv=False):
+def fetch_hanja_parallel(hanja_list, max_workers=4):
+    """
+    Fetch Hanja data in parallel using a pool of SeleniumDriver instances.
+
+    :param hanja_list: The Hanja characters to fetch.
+    :type hanja_list: list
+    :param max_workers: The number of browsers fetching Hanja data in parallel.
+    :type max_workers: int, optional
+    :return: A generator of Hanja data dictionaries in the order they are fetched.
+    :rtype: generator
+    """
+    if not hanja_list:
+        return
+
+    pool_size = min(max_workers, len(hanja_list))
+    browsers = Queue()
+
+    def fetch_worker(idx, hanja):
+        # Borrow a browser from the pool and return it once the fetch is done
+        browser = browsers.get()
+        try:
+            hanja_obj = fetch_hanja_data(hanja, browser)
+        except WebDriverException as e:
+            # Keep the rest of the batch running when a single page fails
+            logger.warning(f"{hanja}: {e.msg}")
+            hanja_obj = {"hanja": hanja}
+        finally:
+            browsers.put(browser)
+
+        if hanja_obj.get("naver_hanja_id") is not None:
+            logger.info(f"[{idx} / {len(hanja_list)}] {hanja}'s data has been fetched.")
+        else:
+            logger.error(f"[{idx} / {len(hanja_list)}] Fetch Failed: {hanja}'")
+        return hanja_obj
+
+    try:
+        # Create a pool of SeleniumDriver instances shared by the workers
+        for _ in range(pool_size):
+            browsers.put(SeleniumDriver())
+
+        # Fetch the Hanja characters in parallel and hand over each one once it is done
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = [
+                executor.submit(fetch_worker, idx, hanja)
+                for idx, hanja in enumerate(hanja_list, 1)
+            ]
+            error = None
+            try:
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    try:
+                        hanja_obj = future.result()
+                    except Exception as e:
+                        # Stop the fetches that haven't started, but keep the ones in progress
+                        if error is None:
+                            error = e
+                            for pending in futures:
+                                pending.cancel()
+                        continue
+                    yield hanja_obj
+            finally:
+                # Drop the fetches that haven't started if the iteration stops early
+                for future in futures:
+                    future.cancel()
+
+            if error is not None:
+                raise error
+    finally:
+        # Close the browser sessions to relase resources
+        while not browsers.empty():
+            browsers.get().quit()
+
+
+def scrape_hanja(hanja_input=None, instant_csv=False, max_workers=4):
     """
     Scrape Hanja data from the Naver Hanja Dictionary website.
 
+    Hanja characters fetched in a previous run are read from the cache at
+    HANJA_CACHE_PATH instead of being scraped again.
+
     :param hanja_input: The Hanja characters to search for, either as a string or a list.
     :type hanja_input: str or list, optional
     :param instant_csv: If True, export the data to a CSV file instantly, else return the results.
     :type instant_csv: bool, optional
+    :param max_workers: The number of browsers fetching Hanja data in parallel.
+    :type max_workers: int, optional
     :return: A list of Hanja data tuples or None if instant_csv is True.
     :rtype: list or None
     """
 
-    # Create a SeleniumDriver instance with common options
-    with SeleniumDriver() as browser:
-        # Create an empty list to store the hanja_objs
-        hanja_objs = []
-
-        # Handle various input formats(console, str, list)
-        if hanja_input is None:
-            hanja_input = input("Enter Hanja characters: ")
-        if isinstance(hanja_input, str):
-            hanja_input = [char for char in hanja_input if is_hanja(char)]
-        if isinstance(hanja_input, list):
-            hanja_list = hanja_input
-        else:
-            raise ValueError("Invalid hanja_input format")
+    # Handle various input formats(console, str, list)
+    if hanja_input is None:
+        hanja_input = input("Enter Hanja characters: ")
+    if isinstance(hanja_input, str):
+        hanja_input = [char for char in hanja_input if is_hanja(char)]
+    if isinstance(hanja_input, list):
+        hanja_list = hanja_input
+    else:
+        raise ValueError("Invalid hanja_input format")
 
-        # Iterate through the list of Hanja characters and fetch their data
-        for idx, hanja in enumerate(hanja_list, 1):
-            hanja_obj = fetch_hanja_data(hanja, browser)
-            hanja_objs.append(hanja_obj)
-            if hanja_obj["naver_hanja_id"] != None:
-                logger.info(
-                    f"[{idx} / {len(hanja_list)}] {hanja}'s data has been fetched."
-                )
-            else:
-                logger.error(f"[{idx} / {len(hanja_list)}] Fetch Failed: {hanja}'")
-
-        # Close the browser session to relase resources
-        logger.info("WebCrawling Finished.")
+    os.makedirs(os.path.dirname(HANJA_CACHE_PATH), exist_ok=True)
+    with shelve.open(HANJA_CACHE_PATH) as cache:
+        # Split the Hanja characters into cache hits and misses
+        hanja_data = {}
+        for hanja in hanja_list:
+            key = f"hanja:{hanja}"
+            if key in cache:
+                hanja_data[hanja] = cache[key]
+        missing_hanja = [
+            hanja for hanja in dict.fromkeys(hanja_list) if hanja not in hanja_data
+        ]
+        if hanja_data:
+            logger.info(f"{len(hanja_data)} Hanja characters are loaded from cache.")
+
+        # Scrape only the missing Hanja characters and store each one as soon as it is fetched
+        for hanja_obj in fetch_hanja_parallel(missing_hanja, max_workers):
+            hanja_data[hanja_obj["hanja"]] = hanja_obj
+            if hanja_obj.get("naver_hanja_id") is not None:
+                cache[f"hanja:{hanja_obj['hanja']}"] = hanja_obj
+
+    logger.info("WebCrawling Finished.")
+
+    # Merge cached and fetched data in the order of the input
+    hanja_objs = [dict(hanja_data[hanja]) for hanja in hanja_list]
 
     if instant_csv == True:
         return export_hanja_csv_data(hanja_objs)
@@ -1,33 +1,48 @@
 import os, re
+from concurrent.futures import ThreadPoolExecutor
 from components.hanja import scrape_hanja
 from components.word import scrape_multiple_words
 from utils.logger import logger
 from utils.anki_utils import create_anki_tags
 
+# Sentinel for columns missing from an entry
+_MISSING = object()
 
-def parse_data_by_regex(data, patterns):
+
+def compile_patterns(patterns):
     """
-    Parse data using regular expressions based on given patterns.
+    Generate a chunk parser specialized for the given patterns.
+
+    The patterns are compiled once and the parser is emitted as straight-line code with one
+    block per pattern line, so parsing a chunk doesn't dispatch on the pattern types.
 
     Args:
-        data (str): The input data to be parsed.
         patterns (list): List of patterns for extracting information.
 
     Returns:
-        dict: A dictionary containing extracted information.
+        function: A parser taking a chunk of text and returning a dictionary of extracted information.
+                  The parser raises ValueError if the chunk has fewer lines than there are patterns.
 
     Raises:
         ValueError: If an invalid pattern or datatype is encountered.
     """
-    result = {}
-    lines = data.strip().split("\n")
+    namespace = {}
+    source = [
+        "def parse_chunk(data):",
+        "    result = {}",
+        # Only split off as many lines as there are patterns, the rest stays in one piece
+        f"    lines = data.strip().split('\\n', {len(patterns)})",
+        # Fail fast on chunks missing lines instead of returning a partial entry
+        f"    if len(lines) < {len(patterns)}:",
+        "        raise ValueError(",
+        f"            f'Expected {len(patterns)} lines in chunk, got {{len(lines)}}: {{data!r}}'",
+        "        )",
+    ]
 
     for i, pattern in enumerate(patterns):
         # Handle single string pattern
         if isinstance(pattern, str):
-            match = re.match(pattern, lines[i])
-            if match:
-                result.update(match.groupdict())
+            regex, delimiter = pattern, None
         elif isinstance(pattern, tuple):
             # Handle tuple pattern with regex, delimiter
             regex, delimiter, *rest = pattern
@@ -35,22 +50,68 @@ def parse_data_by_regex(data, patterns):
                 raise ValueError(
                     f"Invalid number of elements in tuple pattern at index {i}. Expected 2, got {len(pattern)}"
                 )
-            match = re.match(regex, lines[i])
-            if match:
-                result.update(match.groupdict())
-                key = list(match.groupdict().keys())[0]
-                if key in result:
-                    result[key] = result[key].split(delimiter)
         else:
             raise ValueError(f"Invalid datatype for pattern at index {i}")
 
-    return result
+        regex = re.compile(regex)
+        namespace[f"match_{i}"] = regex.match
+        source += [
+            f"    match = match_{i}(lines[{i}])",
+            "    if match:",
+            "        result.update(match.groupdict())",
+        ]
+
+        # Split the first named group of tuple patterns by its delimiter
+        if delimiter is not None:
+            if not regex.groupindex:
+                raise ValueError(
+                    f"Tuple pattern at index {i} should contain a named group to split"
+                )
+            key = next(iter(regex.groupindex))
+            namespace[f"delimiter_{i}"] = delimiter
+            source.append(
+                f"        result[{key!r}] = match.group({key!r}).split(delimiter_{i})"
+            )
+
+    source.append("    return result")
+    exec(compile("\n".join(source), "<compile_patterns>", "exec"), namespace)
+
+    return namespace["parse_chunk"]
+
+
+def iter_chunks(file_path, delimiter="\n\n", bufsize=1 << 20):
+    """
+    Lazily read a text file and yield its content split by a delimiter.
+
+    Args:
+        file_path (str): The path to the text file.
+        delimiter (str, optional): The delimiter used to split the content of the file. Defaults to "\n\n".
+        bufsize (int, optional): The number of characters read at a time. Defaults to 1 MiB.
+
+    Yields:
+        str: Each chunk of the file, the same as content.split(delimiter) would produce.
+    """
+    # Read txt file in UTF-8
+    with open(file_path, "r", encoding="utf-8") as file:
+        tail = ""
+        while True:
+            block = file.read(bufsize)
+            if not block:
+                break
+
+            # Keep the last piece since it may continue in the next block
+            *chunks, tail = (tail + block).split(delimiter)
+            yield from chunks
+
+    yield tail
 
 
 def process_txt_file(file_path, patterns, delimiter="\n\n"):
     """
     Read a text file, process it using specified patterns, and extract data into dictionaries.
 
+    Blank chunks are skipped, while a chunk with fewer lines than patterns raises ValueError.
+
     Args:
         file_path (str): The path to the text file.
         patterns (list): List of patterns for extracting information.
@@ -63,18 +124,16 @@ def process_txt_file(file_path, patterns, delimiter="\n\n"):
     if not file_path.startswith("data/input/"):
         file_path = os.path.join("data/input", file_path)
 
-    # Read txt file in UTF-8
-    with open(file_path, "r", encoding="utf-8") as file:
-        content = file.read()
-
-    # Split content into chunks based on delimiter
-    chunks = content.split(delimiter)
-    processed_data = []
+    # Compile patterns once for every chunk
+    parse_chunk = compile_patterns(patterns)
 
-    # Process each chunk and extract data into dictionaries using specified patterns
-    for chunk in chunks:
-        entry = parse_data_by_regex(chunk, patterns)
-        processed_data.append(entry)
+    # Process each chunk and extract data into dictionaries using specified patterns,
+    # skipping blank chunks such as the one left by a trailing delimiter
+    processed_data = [
+        parse_chunk(chunk)
+        for chunk in iter_chunks(file_path, delimiter)
+        if chunk.strip()
+    ]
 
     return processed_data
 
@@ -90,9 +149,7 @@ def scrape_data(input_data):
         list: A list of dictionaries containing merged input data with scraped data.
     """
 
-    ## Before Scrapping, check hanja is stored in DB
-
-    # Scrape hanja data using input hanja entries
+    # Scrape hanja data using input hanja entries, reusing cached entries
     scrapped_hanja = scrape_hanja([entry["hanja"] for entry in input_data])
     # Create Anki Tags
 
@@ -119,22 +176,27 @@ def apply_modifiers(data, modifiers):
         return data
 
     for modifier in modifiers:
-        try:
-            # Check if the modifier is a tuple containing a function and a column name
-            if isinstance(modifier, tuple):
-                # Apply the modifier function to each entry in the data
-                func, column = modifier
+        # Check if the modifier is a tuple containing a function and a column name
+        if isinstance(modifier, tuple):
+            # Apply the modifier function to each entry in the data
+            func, column = modifier
+            entry = None
+            try:
                 for entry in data:
-                    if column in entry:
-                        entry[column] = func(entry[column])
-            else:
-                # If the modifier is not a tuple, assume it's a single function and apply it to the entire data
+                    value = entry.get(column, _MISSING)
+                    if value is not _MISSING:
+                        entry[column] = func(value)
+            except Exception as e:
+                logger.warning(f"Error occurred in modifier: {modifier}, {e}")
+                logger.warning(f"Error in entry: {entry}")
+        else:
+            # If the modifier is not a tuple, assume it's a single function and apply it to the entire data
+            try:
                 data = modifier(data)
-        except Exception as e:
-            logger.warning(
-                f"Error occurred in modifier: {modifier.__name__ if callable(modifier) else modifier}, {e}"
-            )
-            logger.warning(f"Error in entry: {entry}")
+            except Exception as e:
+                logger.warning(
+                    f"Error occurred in modifier: {getattr(modifier, '__name__', modifier)}, {e}"
+                )
 
     return data
 
@@ -150,20 +212,13 @@ def merge_list_of_dicts(data1, data2):
     Returns:
         list: A list containing merged dictionaries.
     """
-    merged_list = []
+    merged_list = [{**entry1, **entry2} for entry1, entry2 in zip(data1, data2)]
 
-    for entry1, entry2 in zip(data1, data2):
-        merged_dict = entry1.copy()
-
-        for key, value in entry2.items():
-            if key in merged_dict:
-                if isinstance(merged_dict[key], list):
-                    merged_dict[key] = merged_dict[key][0]
-                else:
-                    merged_dict[key] = value
-            else:
-                merged_dict[key] = value
-        merged_list.append(merged_dict)
+    # Shared keys holding a list in the first dictionary keep its first item instead
+    for merged_dict, entry1, entry2 in zip(merged_list, data1, data2):
+        for key in entry1.keys() & entry2.keys():
+            if isinstance(entry1[key], list):
+                merged_dict[key] = entry1[key][0]
 
     return merged_list
 
@@ -200,6 +255,10 @@ def process_hanja_txt(
     """
     Process a text file, extract and merge data, and apply modifiers.
 
+    Hanja and words are scraped concurrently from the entries read from the text file, so the
+    hanja modifiers and the words modifiers are independent: hanja modifiers don't affect the
+    hanja, words or reference_idx used to scrape words.
+
     Args:
         file_path (str): The path to the text file.
         patterns (list): List of patterns for extracting information.
@@ -222,10 +281,16 @@ def process_hanja_txt(
         patterns=patterns,
     )
 
-    ## Before Scrapping, check hanja is stored in DB
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Scraping words data in the background from the input entries,
+        # so hanja modifiers don't apply to the words being scraped
+        words_future = executor.submit(scrape_multiple_words, input_hanja)
+
+        # Scraping additional data for hanja data meanwhile
+        hanja_data = scrape_data(input_hanja)
+        scrapped_words = words_future.result()
 
-    # Scraping additional data and applying modifiers for hanja data
-    hanja_data = scrape_data(input_hanja)
+    # Applying modifiers for hanja data
     hanja_data = apply_modifiers(hanja_data, hanja_modifiers)
     hanja_data = create_anki_tags(
         data=hanja_data,
@@ -233,8 +298,7 @@ def process_hanja_txt(
         values=("漢字", "{rank}", "暗記博士1", "{reference_idx}"),
     )
 
-    # Scraping words data and applying modifiers
-    scrapped_words = scrape_multiple_words(hanja_data)
+    # Applying modifiers for words data
     scrapped_words = apply_modifiers(scrapped_words, words_modifiers)
     scrapped_words = create_anki_tags(
         data=scrapped_words,
@@ -83,7 +83,7 @@ def fetch_word_id(word_pair, browser):
     try:
         # Check if the search page entry exists
         browser.find_element(By.ID, "searchPage_entry")
-    except:
+    except NoSuchElementException:
         logger.warning(f"{word_pair['hanja']} doesn't exist in korean dictionary.")
         return
 
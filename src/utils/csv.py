@@ -52,22 +52,36 @@ def export_to_csv(fieldnames, data, keyword, filename=None, is_header=True):
     # Write data to CSV file
     file_mode = "w" if filename is None else "a"
     with open(
-        f"data/output/{output_name}", file_mode, newline="", encoding="utf-8"
+        f"data/output/{output_name}",
+        file_mode,
+        newline="",
+        encoding="utf-8",
+        buffering=1 << 20,
     ) as csvfile:
-        csvwriter = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        csvwriter = csv.writer(csvfile)
 
         # Write header only if the file is newly created
         if file_mode == "w" and is_header:
-            csvwriter.writeheader()
+            csvwriter.writerow(fieldnames)
 
-        for row in data:
-            # Convert list values to a string with "<br>" delimiter
-            for key, value in row.items():
-                if isinstance(value, list):
-                    row[key] = "<br>".join(map(str, value))
-                elif isinstance(value, tuple):
-                    row[key] = "+".join(map(str, value))
-
-            csvwriter.writerow(row)
+        # Write rows positionally in the order of fieldnames
+        csvwriter.writerows(
+            [format_csv_value(row[key]) for key in fieldnames] for row in data
+        )
 
     return output_name
+
+
+def format_csv_value(value):
+    """
+    Convert list and tuple values into strings for the CSV file.
+
+    :param value: A value of a row of the CSV file.
+    :return: The value with lists joined by "<br>" and tuples joined by "+".
+    """
+    if isinstance(value, list):
+        return "<br>".join(map(str, value))
+    elif isinstance(value, tuple):
+        return "+".join(map(str, value))
+
+    return value
@@ -1,3 +1,4 @@
+from threading import Lock
 from utils.logger import logger
 from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
@@ -26,6 +27,15 @@ class SeleniumDriver(webdriver.Chrome):
     """
 
     _with_depth = 0  # Counter to track the depth of nested 'with' statements
+    _install_lock = Lock()  # Lock serializing chromedriver installation across threads
+
+    # Chrome content settings blocking images (2 = block)
+    content_prefs = {
+        "profile.managed_default_content_settings.images": 2,
+    }
+
+    # URL patterns of font files blocked through the DevTools protocol
+    blocked_urls = ["*.woff", "*.woff2", "*.ttf", "*.otf"]
 
     def __init__(self, options=None):
         chrome_options = webdriver.ChromeOptions()
@@ -42,18 +52,30 @@ class SeleniumDriver(webdriver.Chrome):
                 "--disable-logging",
                 "--no-sandbox",
                 "--disable-gpu",
+                "--blink-settings=imagesEnabled=false",
             ]
             options = default_options
 
         for opt in options:
             chrome_options.add_argument(opt)
 
+        # Skip loading resources that are never parsed (only page text is scraped)
+        chrome_options.add_experimental_option("prefs", self.content_prefs)
+
+        # Install chromedriver one thread at a time, as drivers may be created concurrently
+        with self._install_lock:
+            driver_path = ChromeDriverManager().install()
+
         # Initialize the WebDriver with configured options
         super().__init__(
-            service=ChromeService(ChromeDriverManager().install()),
+            service=ChromeService(driver_path),
             options=chrome_options,
         )
 
+        # Chrome has no content setting for fonts, so block font requests directly
+        self.execute_cdp_cmd("Network.enable", {})
+        self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+
     def __enter__(self):
         """
         Enter method for using the class with the 'with' statement. Increments the 'with' depth.